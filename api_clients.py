@@ -1,37 +1,120 @@
 # api_clients.py
+import functools
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import orjson
 import requests
-from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+from typing import Dict, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds for every outbound call
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Static query parameters are encoded once; only `q` is appended per call
+_NOMINATIM_SEARCH_URL = (
+    "https://nominatim.openstreetmap.org/search?format=json&limit=1&q="
+)
+_NOMINATIM_HEADERS = {"User-Agent": "MoveGuiderAI/1.0"}
+_WEATHERAPI_FORECAST_URL = (
+    "http://api.weatherapi.com/v1/forecast.json?days=7&aqi=no&alerts=no"
+)
+
+
+def _create_session() -> requests.Session:
+    """
+    Builds the shared HTTP session. Keep-alive lets repeated calls to the same
+    host (Nominatim, WeatherAPI) reuse one TCP/TLS connection instead of
+    paying a fresh handshake on every request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Module-level, so it lives for the whole server process across Streamlit reruns
+_SESSION = _create_session()
+
+# --- Forecast cache: memory first, then disk, by coordinate bucket or place name ---
+WEATHER_CACHE_TTL = 3600  # seconds
+WEATHER_CACHE_MAX_ENTRIES = 1000
+WEATHER_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".weather_cache")
+_weather_memory_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Runs of punctuation/whitespace, collapsed when keying forecasts by place name
+_NAME_KEY_SEPARATORS = re.compile(r"[\W_]+")
+# Striped locks: bounded no matter how many distinct keys are seen
+_FETCH_LOCKS = [threading.Lock() for _ in range(16)]
+
+
+class WeatherAPIError(Exception):
+    """
+    A failed WeatherAPI.com call. `status_code` is the HTTP status, or None
+    when no response came back (timeout, connection error, bad JSON).
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 def resolve_latlon_nominatim(city_name: str) -> Optional[Dict[str, float]]:
     """
-    Resolves a city name to latitude and longitude using Nominatim.
-    This function is perfect and remains unchanged.
+    Resolves a city name to latitude and longitude using Nominatim, over the
+    shared keep-alive session; returns None if the place isn't found.
     """
     if not city_name:
         return None
-    url = "https://nominatim.openstreetmap.org/search"
-    params = {"q": city_name, "format": "json", "limit": 1}
-    headers = {"User-Agent": "MoveGuiderAI/1.0"}
+    url = _NOMINATIM_SEARCH_URL + quote(city_name)
 
-    print(f"[INFO] Resolving coordinates for '{city_name}' via Nominatim...")
+    logger.debug("Resolving coordinates for '%s' via Nominatim...", city_name)
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = _SESSION.get(
+            url, headers=_NOMINATIM_HEADERS, timeout=REQUEST_TIMEOUT
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         if data:
             lat = float(data[0]["lat"])
             lon = float(data[0]["lon"])
-            print(f"[SUCCESS] Resolved '{city_name}' to Lat: {lat}, Lon: {lon}")
+            logger.debug("Resolved '%s' to Lat: %s, Lon: %s", city_name, lat, lon)
             return {"lat": lat, "lon": lon}
         else:
-            print(f"[WARN] Nominatim could not find coordinates for '{city_name}'.")
+            logger.warning("Nominatim could not find coordinates for '%s'.", city_name)
             return None
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] Nominatim API call failed: {e}")
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        logger.error("Nominatim API call failed: %s", e)
         return None
 
 
+def _fetch_forecast(query: str, api_key: str) -> Dict[str, Any]:
+    """
+    Calls the WeatherAPI.com forecast endpoint for any supported `q` value.
+    Raises WeatherAPIError, carrying the HTTP status, on any failure.
+    """
+    url = f"{_WEATHERAPI_FORECAST_URL}&key={quote(api_key)}&q={quote(query)}"
+
+    logger.debug("Calling WeatherAPI.com for forecast at %s...", query)
+    try:
+        response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        logger.debug("WeatherAPI.com call successful.")
+        return orjson.loads(response.content)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        logger.error("WeatherAPI.com call failed: %s", e)
+        # HTTPError carries the response; timeouts and bad JSON have no status
+        error_response = getattr(e, "response", None)
+        status_code = error_response.status_code if error_response is not None else None
+        raise WeatherAPIError(str(e), status_code) from e
+
+
 def get_weather_data_from_weatherapi(
     lat: float, lon: float, api_key: str
 ) -> Optional[Dict[str, Any]]:
@@ -39,24 +122,130 @@ def get_weather_data_from_weatherapi(
     NEW: Fetches weather data from WeatherAPI.com.
     This replaces the old OpenWeatherMap function.
     """
-    base_url = "http://api.weatherapi.com/v1/forecast.json"
     # Format lat/lon as a string for the 'q' parameter
-    lat_lon_str = f"{lat},{lon}"
+    try:
+        return _fetch_forecast(f"{lat},{lon}", api_key)
+    except WeatherAPIError:
+        return None
 
-    params = {
-        "key": api_key,
-        "q": lat_lon_str,
-        "days": 7,  # We need a 7-day forecast
-        "aqi": "no",
-        "alerts": "no",
-    }
 
-    print(f"[INFO] Calling WeatherAPI.com for forecast at {lat_lon_str}...")
+def get_weather_data_from_weatherapi_by_name(
+    city_name: str, api_key: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetches the forecast for a place name directly; WeatherAPI.com geocodes
+    it itself, which saves the Nominatim round trip.
+    """
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
-        print(f"[SUCCESS] WeatherAPI.com call successful.")
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"[ERROR] WeatherAPI.com call failed: {e}")
+        return _fetch_forecast(city_name, api_key)
+    except WeatherAPIError:
         return None
+
+
+@functools.lru_cache(maxsize=8)
+def api_key_fingerprint(api_key: str) -> str:
+    """
+    Short, non-reversible tag for an API key. Forecast caches include it in
+    their keys, so entries fetched under a rotated key are never served.
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+def _weather_cache_path(key: str) -> str:
+    return os.path.join(WEATHER_CACHE_DIR, f"{key}.json")
+
+
+def _remember_weather(key: str, fetched_at: float, data: Dict[str, Any]):
+    # Re-inserting doesn't move an existing key, so drop it first; a refreshed
+    # entry then sits at the end instead of being the next one evicted
+    _weather_memory_cache.pop(key, None)
+    _weather_memory_cache[key] = (fetched_at, data)
+    if len(_weather_memory_cache) > WEATHER_CACHE_MAX_ENTRIES:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        _weather_memory_cache.pop(next(iter(_weather_memory_cache)), None)
+
+
+def _prune_weather_cache_dir(now: float):
+    """
+    Deletes expired forecast files (and tmp files left by a crashed write), so
+    the disk tier holds at most about one TTL's worth of fetches.
+    """
+    try:
+        entries = list(os.scandir(WEATHER_CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime >= WEATHER_CACHE_TTL:
+                os.remove(entry.path)
+        except OSError:
+            pass  # Already removed by a concurrent prune
+
+
+def _get_cached_forecast(key: str, query: str, api_key: str) -> Dict[str, Any]:
+    """
+    Memory, then disk, then the API for one forecast cache entry.
+    Failed calls raise WeatherAPIError and are never cached.
+    """
+    key = f"{key}_{api_key_fingerprint(api_key)}"
+    now = time.time()
+
+    cached = _weather_memory_cache.get(key)
+    if cached and now - cached[0] < WEATHER_CACHE_TTL:
+        return cached[1]
+
+    # Concurrent misses for the same key queue here, so only the first one
+    # calls the API and the rest find its result in memory
+    with _FETCH_LOCKS[hash(key) % len(_FETCH_LOCKS)]:
+        cached = _weather_memory_cache.get(key)
+        if cached and time.time() - cached[0] < WEATHER_CACHE_TTL:
+            return cached[1]
+
+        path = _weather_cache_path(key)
+        try:
+            fetched_at = os.path.getmtime(path)
+            if now - fetched_at < WEATHER_CACHE_TTL:
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read())
+                _remember_weather(key, fetched_at, data)
+                return data
+        except (IOError, orjson.JSONDecodeError):
+            pass  # Missing or unreadable entry: fall through to the API
+
+        data = _fetch_forecast(query, api_key)
+        _remember_weather(key, now, data)
+        try:
+            os.makedirs(WEATHER_CACHE_DIR, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_path, path)
+        except IOError as e:
+            logger.warning("Could not write forecast cache file: %s", e)
+        # Writes happen at most once per key per TTL, so pruning here is cheap
+        _prune_weather_cache_dir(now)
+        return data
+
+
+def get_cached_weather_data(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
+    """
+    Two-tier cache in front of the WeatherAPI.com forecast call.
+    Coordinates are rounded to 2 decimals so "Tempe, AZ" and "Tempe AZ" share
+    one entry, and the disk tier survives server restarts.
+    Raises WeatherAPIError when the forecast can't be fetched.
+    """
+    lat, lon = round(lat, 2), round(lon, 2)
+    return _get_cached_forecast(f"{lat}_{lon}", f"{lat},{lon}", api_key)
+
+
+def get_cached_weather_data_by_name(city_name: str, api_key: str) -> Dict[str, Any]:
+    """
+    Same two-tier cache as get_cached_weather_data, keyed on the place name.
+    The key ignores case, punctuation and spacing, so "Tempe AZ" and
+    "tempe, az" share one entry. Raises WeatherAPIError on failure; a 400
+    status means WeatherAPI.com didn't recognize the name.
+    """
+    query = city_name.strip()
+    normalized = _NAME_KEY_SEPARATORS.sub(" ", query.casefold()).strip()
+    return _get_cached_forecast("name_" + quote(normalized, safe=""), query, api_key)
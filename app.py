@@ -1,11 +1,23 @@
 # app.py
+import functools
+import hashlib
+import logging
 import streamlit as st
 import pandas as pd
+import plotly.io as pio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time
+from typing import Any, Dict, Optional, Tuple
 
 # --- REFACTORED & NEW IMPORTS ---
-from config import WEATHERAPI_API_KEY
-from api_clients import resolve_latlon_nominatim, get_weather_data_from_weatherapi
+from config import WEATHERAPI_API_KEY, MissingAPIKeyError
+from api_clients import (
+    resolve_latlon_nominatim,
+    get_cached_weather_data,
+    get_cached_weather_data_by_name,
+    api_key_fingerprint,
+    WeatherAPIError,
+)
 from logic.weather_parser import parse_weather_data
 from logic.planner import (
     create_unified_df,
@@ -29,6 +41,15 @@ from plotting.gantt import plot_gantt_schedule
 
 st.set_page_config(page_title="MoveGuiderAI", layout="wide")
 
+# Only warnings and errors reach stdout; per-request success chatter is DEBUG
+logging.basicConfig(
+    level=logging.WARNING, format="[%(levelname)s] %(name)s: %(message)s"
+)
+
+# Streamlit serializes every chart through plotly.io.to_json; orjson is a
+# declared dependency, so select it explicitly rather than relying on "auto"
+pio.json.config.default_engine = "orjson"
+
 # --- Initialize Session State ---
 if "active_profile" not in st.session_state:
     profiles = load_profiles()
@@ -52,62 +73,73 @@ with st.sidebar:
     )
     if st.button("Load Profile"):
         st.session_state.active_profile = load_profiles().get(selected_profile_name, {})
+        # No st.rerun(): the settings widgets below read active_profile later in
+        # this same run, so they already show the loaded profile
         st.success(f"Profile '{selected_profile_name}' loaded!")
-        st.rerun()
 
     # Get current values from session state for editing
     active_profile_data = st.session_state.active_profile
     user_settings = active_profile_data.get("user_settings", {})
-    routine_df = pd.DataFrame(active_profile_data.get("routine", []))
-
-    st.subheader("Your Settings")
-
-    # --- NEW Chronotype Selector ---
-    chronotype_options = ["Default", "Morning Lark", "Night Owl"]
-    chronotype = st.selectbox(
-        "Your Chronotype",
-        options=chronotype_options,
-        index=chronotype_options.index(user_settings.get("chronotype", "Default")),
-    )
+    # Only rebuild the editor's DataFrame when a different routine is loaded,
+    # not on every widget-triggered rerun
+    routine = active_profile_data.get("routine", [])
+    if st.session_state.get("routine_df_source") is not routine:
+        st.session_state.routine_df_source = routine
+        st.session_state.routine_df = pd.DataFrame(routine)
+    routine_df = st.session_state.routine_df
+
+    # Edits inside the form are sent in one batch on Save, instead of each
+    # keystroke or cell edit rerunning the whole app
+    with st.form("profile_form"):
+        st.subheader("Your Settings")
+
+        # --- NEW Chronotype Selector ---
+        chronotype_options = ["Default", "Morning Lark", "Night Owl"]
+        chronotype = st.selectbox(
+            "Your Chronotype",
+            options=chronotype_options,
+            index=chronotype_options.index(user_settings.get("chronotype", "Default")),
+        )
 
-    weight = st.number_input(
-        "Your Weight (kg)",
-        min_value=40,
-        max_value=150,
-        value=user_settings.get("weight_kg", 75),
-    )
-    wake_str = st.text_input(
-        "Wake-up time (HH:MM)", value=user_settings.get("wake_time", "06:00")
-    )
-    sleep_str = st.text_input(
-        "Bedtime (HH:MM)", value=user_settings.get("sleep_time", "22:30")
-    )
+        weight = st.number_input(
+            "Your Weight (kg)",
+            min_value=40,
+            max_value=150,
+            value=user_settings.get("weight_kg", 75),
+        )
+        wake_str = st.text_input(
+            "Wake-up time (HH:MM)", value=user_settings.get("wake_time", "06:00")
+        )
+        sleep_str = st.text_input(
+            "Bedtime (HH:MM)", value=user_settings.get("sleep_time", "22:30")
+        )
 
-    st.subheader("Your Daily Routine (Home Timezone: AZ)")
-    edited_routine_df = st.data_editor(
-        routine_df, num_rows="dynamic", use_container_width=True
-    )
+        st.subheader("Your Daily Routine (Home Timezone: AZ)")
+        edited_routine_df = st.data_editor(
+            routine_df, num_rows="dynamic", use_container_width=True
+        )
 
-    st.subheader("Save Changes")
-    new_profile_name = st.text_input(
-        "Save as profile name", value=selected_profile_name
-    )
-    if st.button("Save Profile"):
-        updated_profile = {
-            "user_settings": {
-                "weight_kg": weight,
-                "wake_time": wake_str,
-                "sleep_time": sleep_str,
-                "chronotype": chronotype,
-            },
-            "routine": edited_routine_df.to_dict("records"),
-        }
-        save_profile(new_profile_name, updated_profile)
-        st.session_state.active_profile = updated_profile
-        st.success(f"Profile '{new_profile_name}' saved successfully!")
+        st.subheader("Save Changes")
+        new_profile_name = st.text_input(
+            "Save as profile name", value=selected_profile_name
+        )
+        if st.form_submit_button("Save Profile"):
+            updated_profile = {
+                "user_settings": {
+                    "weight_kg": weight,
+                    "wake_time": wake_str,
+                    "sleep_time": sleep_str,
+                    "chronotype": chronotype,
+                },
+                "routine": edited_routine_df.to_dict("records"),
+            }
+            save_profile(new_profile_name, updated_profile)
+            st.session_state.active_profile = updated_profile
+            st.success(f"Profile '{new_profile_name}' saved successfully!")
 
 
 # --- Helper to convert string times from profile to time objects ---
+@functools.lru_cache(maxsize=128)
 def get_time_from_str(time_str: str, default_time: time) -> time:
     try:
         return datetime.strptime(time_str, "%H:%M").time()
@@ -115,98 +147,104 @@ def get_time_from_str(time_str: str, default_time: time) -> time:
         return default_time
 
 
-# --- Caching function for weather data ---
-@st.cache_data(ttl=3600)
-def get_city_data(city_name: str):
-    # (This function remains unchanged)
-    from api_clients import resolve_latlon_nominatim, get_weather_data_from_weatherapi
-    from logic.weather_parser import parse_weather_data
+# --- Per-endpoint caches ---
+FORECAST_TTL_SECONDS = 3600
+
 
+class CityLookupError(Exception):
+    """Raised inside the cached fetchers so that failed lookups are never cached."""
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def get_cached_coordinates(city_name: str) -> Dict[str, float]:
+    """Geocodes never change, so they are persisted to disk with no expiry."""
     coordinates = resolve_latlon_nominatim(city_name)
     if not coordinates:
-        st.error(
+        raise CityLookupError(
             f"Could not find coordinates for '{city_name}'. Please try a different name or format."
         )
-        return None
-    weather_data = get_weather_data_from_weatherapi(
-        coordinates["lat"], coordinates["lon"], WEATHERAPI_API_KEY
-    )
-    if not weather_data:
-        st.error(f"Failed to fetch weather data for {city_name}.")
-        return None
-    return parse_weather_data(weather_data)
+    return coordinates
 
 
-# --- Move Checklist Generator ---
-def generate_move_checklist(city1, city2, plan_mode, sim_month, user_profile):
+@st.cache_data(ttl=FORECAST_TTL_SECONDS, show_spinner=False)
+def get_cached_forecast(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
     """
-    Generates a personalized move checklist based on cities, planning mode, month, and user profile.
+    Forecasts go stale, so they keep their own one-hour TTL.
+    WeatherAPIError propagates, so failures are never cached.
     """
-    checklist = []
-    # General items
-    checklist.append(
-        f"✅ Research cost of living and housing in both {city1.split(',')[0]} and {city2.split(',')[0]}"
-    )
-    checklist.append(
-        f"✅ Check visa/work permit requirements if moving internationally"
-    )
-    checklist.append(
-        f"✅ Set up mail forwarding and update your address with banks, subscriptions, etc."
-    )
-    checklist.append(
-        f"✅ Arrange for internet and utilities setup at your new location"
-    )
-    checklist.append(f"✅ Back up important digital files and documents")
-    checklist.append(
-        f"✅ Notify your employer/team of your move and update your working hours if needed"
-    )
+    return get_cached_weather_data(lat, lon, api_key)
 
-    # Weather/seasonal items
-    if plan_mode == "Seasonal Simulation" and sim_month:
-        checklist.append(
-            f"✅ Review typical weather for {sim_month} in both cities (see above charts)"
-        )
-        checklist.append(
-            f"✅ Pack clothing suitable for {sim_month} conditions in {city2.split(',')[0]}"
-        )
-        checklist.append(
-            f"✅ Prepare for local climate: e.g., {'high humidity' if 'Humidity' in user_profile.get('user_settings', {}).get('chronotype', '') else 'heat/UV'} in {sim_month}"
-        )
-    else:
-        checklist.append(
-            f"✅ Check 7-day weather forecast for both cities (see above charts)"
-        )
-        checklist.append(
-            f"✅ Pack for current weather conditions in {city2.split(',')[0]}"
-        )
 
-    # Routine/time zone items
-    wake = user_profile.get("user_settings", {}).get("wake_time", "07:00")
-    sleep = user_profile.get("user_settings", {}).get("sleep_time", "22:00")
-    checklist.append(
-        f"✅ Adjust your daily routine: wake at {wake}, sleep at {sleep} (local time)"
-    )
-    checklist.append(f"✅ Update calendar events and reminders to new time zone")
-    checklist.append(
-        f"✅ Plan for best workout times based on local weather (see recommendations above)"
-    )
+@st.cache_data(ttl=FORECAST_TTL_SECONDS, show_spinner=False)
+def get_cached_forecast_by_name(city_name: str, api_key: str) -> Dict[str, Any]:
+    """One WeatherAPI call that geocodes and forecasts in a single request."""
+    return get_cached_weather_data_by_name(city_name, api_key)
 
-    # Health & wellness
-    checklist.append(
-        f"✅ Review hydration needs for your new city (see Hydration Timeline)"
-    )
-    checklist.append(
-        f"✅ Prepare for changes in sunlight hours (see Gantt/energy charts)"
-    )
-    checklist.append(f"✅ Set up a new healthcare provider if needed")
 
-    # Remote work
-    checklist.append(
-        f"✅ Test your remote work setup (Wi-Fi, VPN, video calls) in the new location"
-    )
-    checklist.append(f"✅ Research local coworking spaces or cafes if needed")
+# --- Caching function for weather data ---
+# Not persisted: Streamlit ignores ttl for persist="disk" caches, which would
+# serve stale forecasts after a restart. The raw forecast is already kept on
+# disk (with its TTL) by api_clients.get_cached_weather_data.
+@st.cache_data(ttl=FORECAST_TTL_SECONDS, max_entries=256, show_spinner=False)
+def get_city_data(
+    city_name: str, api_key: str
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Fetches and parses the forecast for a city. Returns a (DataFrame, error)
+    pair instead of calling st.error, so it can safely run in a worker thread.
+    The API key is an explicit argument so that rotating it invalidates the
+    cached entries.
+    """
+    try:
+        return parse_weather_data(get_cached_forecast_by_name(city_name, api_key)), None
+    except WeatherAPIError as e:
+        # Only a 400 means WeatherAPI didn't recognize the name; a bad key,
+        # an outage or a timeout would fail the coordinate query the same way
+        if e.status_code != 400:
+            return None, f"Failed to fetch weather data for {city_name}."
+    try:
+        coordinates = get_cached_coordinates(city_name)
+    except CityLookupError as e:
+        return None, str(e)
+    try:
+        weather_data = get_cached_forecast(
+            coordinates["lat"], coordinates["lon"], api_key
+        )
+    except WeatherAPIError:
+        return None, f"Failed to fetch weather data for {city_name}."
+    return parse_weather_data(weather_data), None
 
-    return checklist
+
+# --- Memoized planner calls ---
+# These are pure functions of the city DataFrames and the routine, so reruns
+# triggered by unrelated widgets (e.g. the workout duration input) reuse them.
+def _hash_weather_df(df: pd.DataFrame) -> str:
+    """
+    Cheap cache key for a parsed forecast: digests the raw index, numeric and
+    sunrise/sunset buffers instead of letting Streamlit hash every cell.
+    """
+    digest = hashlib.md5(repr((tuple(df.columns), str(df.index.tz))).encode())
+    digest.update(df.index.asi8.tobytes())
+    digest.update(df.select_dtypes("number").to_numpy().tobytes())
+    # The workout finder and Gantt shading read the sun times too
+    for column in ("sunrise", "sunset"):
+        if column in df:
+            digest.update(pd.DatetimeIndex(df[column]).asi8.tobytes())
+    return digest.hexdigest()
+
+
+_planner_cache = st.cache_data(
+    show_spinner=False, hash_funcs={pd.DataFrame: _hash_weather_df}
+)
+cached_build_gantt_df = _planner_cache(build_gantt_df)
+cached_gantt_background_annotations = _planner_cache(get_gantt_background_annotations)
+cached_find_daily_best_workout = _planner_cache(find_daily_best_workout)
+
+# Figures are built from small derived frames, so Streamlit's default hashing
+# is cheap here; cache_resource hands back the same figure without pickling it.
+_figure_cache = st.cache_resource(max_entries=32, show_spinner=False)
+cached_plot_gantt_schedule = _figure_cache(plot_gantt_schedule)
+cached_plot_energy_curve = _figure_cache(plot_energy_curve)
 
 
 # --- Main App Body ---
@@ -220,19 +258,57 @@ with col2:
     city2_name = st.text_input("With City (Green)", "Dallas, TX")
 
 if st.button("Generate Comparison", type="primary"):
-    df1 = get_city_data(city1_name)
-    df2 = get_city_data(city2_name)
-    if df1 is not None and df2 is not None:
-        st.session_state["df1"] = df1
-        st.session_state["df2"] = df2
-        st.session_state["city1"] = city1_name
-        st.session_state["city2"] = city2_name
+    try:
+        api_key = WEATHERAPI_API_KEY()
+    except MissingAPIKeyError as e:
+        st.error(str(e))
+        st.stop()
+    # Re-clicking with the same cities and API key while the data is fresh
+    # is a no-op
+    requested = (city1_name, city2_name, api_key_fingerprint(api_key))
+    fetched_at = st.session_state.get("last_fetched_at")
+    data_is_fresh = (
+        st.session_state.get("last_request") == requested
+        and fetched_at is not None
+        and (datetime.now() - fetched_at).total_seconds() < FORECAST_TTL_SECONDS
+    )
+    if not data_is_fresh:
+        if city1_name.strip().casefold() == city2_name.strip().casefold():
+            # Same place on both sides: one fetch serves both
+            with st.spinner("Fetching weather data..."):
+                df1, error1 = get_city_data(city1_name, api_key)
+            df2, error2 = df1, None
+            st.info("Comparing the same city, so both sides show one forecast.")
+        else:
+            # The two cities are independent, I/O-bound fetches: run them
+            # concurrently so the wall time is the slower city, not the sum.
+            with (
+                st.spinner("Fetching weather data..."),
+                ThreadPoolExecutor(max_workers=2) as executor,
+            ):
+                (df1, error1), (df2, error2) = executor.map(
+                    get_city_data,
+                    [city1_name, city2_name],
+                    [api_key, api_key],
+                )
+        for error in (error1, error2):
+            if error:
+                st.error(error)
+        if df1 is not None and df2 is not None:
+            st.session_state["df1"] = df1
+            st.session_state["df2"] = df2
+            st.session_state["city1"] = city1_name
+            st.session_state["city2"] = city2_name
+            st.session_state["last_request"] = requested
+            st.session_state["last_fetched_at"] = datetime.now()
 
 # --- Display charts if data is available ---
 if "df1" in st.session_state:
     # (Data loading and user settings retrieval remain the same)
     df1, df2 = st.session_state["df1"], st.session_state["df2"]
     c1_name, c2_name = st.session_state["city1"], st.session_state["city2"]
+    # Short display names ("Tempe" for "Tempe, AZ"), also the Gantt resource keys
+    c1_short, c2_short = c1_name.split(",", 1)[0], c2_name.split(",", 1)[0]
 
     current_settings = st.session_state.active_profile.get("user_settings", {})
     user_weight_kg = current_settings.get("weight_kg", 75)
@@ -250,20 +326,20 @@ if "df1" in st.session_state:
         "Your AZ-based routine, visualized in local time with environmental context."
     )
 
-    gantt_df = build_gantt_df(user_routine, df1, c1_name, df2, c2_name)
+    gantt_df = cached_build_gantt_df(user_routine, df1, c1_name, df2, c2_name)
 
     gantt_col1, gantt_col2 = st.columns(2)
     with gantt_col1:
-        df1_gantt = gantt_df[gantt_df["Resource"] == c1_name.split(",")[0]]
-        bg_shapes1 = get_gantt_background_annotations(df1)
-        gantt_fig1 = plot_gantt_schedule(df1_gantt, bg_shapes1)
+        df1_gantt = gantt_df[gantt_df["Resource"] == c1_short]
+        bg_shapes1 = cached_gantt_background_annotations(df1)
+        gantt_fig1 = cached_plot_gantt_schedule(df1_gantt, bg_shapes1)
         if gantt_fig1:
             st.plotly_chart(gantt_fig1, use_container_width=True)
 
     with gantt_col2:
-        df2_gantt = gantt_df[gantt_df["Resource"] == c2_name.split(",")[0]]
-        bg_shapes2 = get_gantt_background_annotations(df2)
-        gantt_fig2 = plot_gantt_schedule(df2_gantt, bg_shapes2)
+        df2_gantt = gantt_df[gantt_df["Resource"] == c2_short]
+        bg_shapes2 = cached_gantt_background_annotations(df2)
+        gantt_fig2 = cached_plot_gantt_schedule(df2_gantt, bg_shapes2)
         if gantt_fig2:
             st.plotly_chart(gantt_fig2, use_container_width=True)
 
@@ -285,8 +361,8 @@ if "df1" in st.session_state:
 
         rec_col1, rec_col2 = st.columns(2)
         with rec_col1:
-            st.subheader(f"For {c1_name.split(',')[0]}")
-            recommendations1 = find_daily_best_workout(
+            st.subheader(f"For {c1_short}")
+            recommendations1 = cached_find_daily_best_workout(
                 df1, user_routine, workout_duration
             )
             if recommendations1:
@@ -298,8 +374,8 @@ if "df1" in st.session_state:
                 st.info("No ideal slots found in the next 3 days.")
 
         with rec_col2:
-            st.subheader(f"For {c2_name.split(',')[0]}")
-            recommendations2 = find_daily_best_workout(
+            st.subheader(f"For {c2_short}")
+            recommendations2 = cached_find_daily_best_workout(
                 df2, user_routine, workout_duration
             )
             if recommendations2:
@@ -314,7 +390,7 @@ if "df1" in st.session_state:
 
     # --- UPDATED Energy Curve Call ---
     energy_df = model_energy_curve(wake_time, sleep_time, chronotype_setting)
-    st.plotly_chart(plot_energy_curve(energy_df), use_container_width=True)
+    st.plotly_chart(cached_plot_energy_curve(energy_df), use_container_width=True)
 
     # --- SIMPLIFIED: MOVE CHECKLIST GENERATOR (.txt) ---
     st.header("✅ Your Personalized Move Plan")
@@ -337,6 +413,6 @@ if "df1" in st.session_state:
     st.download_button(
         label="\U0001f4e5 Download Checklist (.txt)",
         data=checklist_text,
-        file_name=f"MoveGuiderAI_Checklist_{c1_name.split(',')[0]}_to_{c2_name.split(',')[0]}.txt",
+        file_name=f"MoveGuiderAI_Checklist_{c1_short}_to_{c2_short}.txt",
         mime="text/plain",
     )
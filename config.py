@@ -1,24 +1,37 @@
 # config.py
+import functools
 import os
-import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+class MissingAPIKeyError(Exception):
+    """Raised when a required API key is not set in the environment."""
+
+    def __init__(self, env_var_name: str):
+        super().__init__(
+            f"{env_var_name} not found in environment variables. "
+            f"Please add '{env_var_name}=\"your-key-here\"' to your .env file."
+        )
+        self.env_var_name = env_var_name
+
+
 # --- API Key Configuration ---
+@functools.cache
 def get_api_key(env_var_name: str) -> str:
-    """Gets an API key from environment variables or exits."""
+    """Gets an API key from environment variables; read once, then cached."""
     api_key = os.getenv(env_var_name)
     if not api_key:
-        print(f"[ERROR] ‼️ {env_var_name} not found in environment variables.")
-        print(f"Please add '{env_var_name}=\"your-key-here\"' to your .env file.")
-        sys.exit(1)
-    print(f"[INFO] ✅ {env_var_name} loaded successfully.")
+        raise MissingAPIKeyError(env_var_name)
     return api_key
 
 
-# --- Load Specific Keys ---
-OPENWEATHER_API_KEY = get_api_key("OPENWEATHER_API_KEY")
-WEATHERAPI_API_KEY = get_api_key("WEATHERAPI_API_KEY")
+# --- Specific Keys (resolved lazily, on first call) ---
+def OPENWEATHER_API_KEY() -> str:
+    return get_api_key("OPENWEATHER_API_KEY")
+
+
+def WEATHERAPI_API_KEY() -> str:
+    return get_api_key("WEATHERAPI_API_KEY")
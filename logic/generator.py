@@ -1,5 +1,30 @@
 # logic/generator.py
 from datetime import datetime
+from typing import List
+
+# --- Static checklist content, built once at import ---
+_HEADER = (
+    "===============================================\n"
+    "    MoveGuiderAI - Your Personalized Move Plan\n"
+    "==============================================="
+)
+_LOGISTICS_ITEMS = (
+    "Research: Cost of living, housing, and neighborhoods.",
+    "Legal: Check visa/work permit requirements if applicable.",
+    "Address Change: Update with USPS/mail service, banks, subscriptions.",
+    "Utilities: Arrange disconnection at old address and setup at new address (Internet, electricity, water, gas).",
+    "Employer: Notify your team of the move and any changes to your working hours.",
+)
+_REMOTE_WORK_ITEMS = (
+    "Day 1 Connectivity: Ensure you have a plan for internet on your first day (e.g., mobile hotspot as a backup).",
+    "Test Your Setup: Once internet is live, test your full remote work stack (VPN, video calls, software access).",
+    "Find Your Spots: Research local coffee shops or coworking spaces with good Wi-Fi as alternatives.",
+)
+
+
+def _section(title: str, items) -> List[str]:
+    """Formats one checklist section as a heading followed by its items."""
+    return [f"\n--- {title.upper()} ---\n", *(f"[ ] {item}" for item in items)]
 
 
 def generate_move_checklist_text(
@@ -14,31 +39,6 @@ def generate_move_checklist_text(
     string suitable for a .txt file.
     """
     city_to_short = city_to.split(",")[0]
-    lines = []
-
-    # Header
-    lines.append("===============================================")
-    lines.append("    MoveGuiderAI - Your Personalized Move Plan")
-    lines.append("===============================================")
-    lines.append(f"\nMoving from: {city_from}")
-    lines.append(f"Moving to: {city_to_short}")
-    lines.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n")
-
-    # Sections
-    def add_section(title, items):
-        lines.append(f"\n--- {title.upper()} ---\n")
-        for item in items:
-            lines.append(f"[ ] {item}")
-
-    # Section 1: Logistics
-    logistics_items = [
-        "Research: Cost of living, housing, and neighborhoods.",
-        "Legal: Check visa/work permit requirements if applicable.",
-        "Address Change: Update with USPS/mail service, banks, subscriptions.",
-        "Utilities: Arrange disconnection at old address and setup at new address (Internet, electricity, water, gas).",
-        "Employer: Notify your team of the move and any changes to your working hours.",
-    ]
-    add_section("1. Logistics & Administration", logistics_items)
 
     # Section 2: Packing
     packing_items = []
@@ -59,7 +59,6 @@ def generate_move_checklist_text(
     packing_items.append(
         "Local Climate Prep: Be ready for local norms (e.g., high humidity gear, rain protection, sunblock)."
     )
-    add_section("2. Packing & Environmental Prep", packing_items)
 
     # Section 3: Wellness
     wake = user_profile.get("user_settings", {}).get("wake_time", "N/A")
@@ -71,14 +70,16 @@ def generate_move_checklist_text(
         f"Hydration: Note the hydration needs for {city_to_short} and plan to drink enough water, especially on day one.",
         "Healthcare: Research and shortlist new doctors, dentists, and other healthcare providers.",
     ]
-    add_section("3. Routine & Wellness Transition", wellness_items)
 
-    # Section 4: Remote Work
-    remote_work_items = [
-        "Day 1 Connectivity: Ensure you have a plan for internet on your first day (e.g., mobile hotspot as a backup).",
-        "Test Your Setup: Once internet is live, test your full remote work stack (VPN, video calls, software access).",
-        "Find Your Spots: Research local coffee shops or coworking spaces with good Wi-Fi as alternatives.",
-    ]
-    add_section("4. Remote Work Setup", remote_work_items)
-
-    return "\n".join(lines)
+    return "\n".join(
+        [
+            _HEADER,
+            f"\nMoving from: {city_from}",
+            f"Moving to: {city_to_short}",
+            f"Generated on: {datetime.now().strftime('%Y-%m-%d')}\n",
+            *_section("1. Logistics & Administration", _LOGISTICS_ITEMS),
+            *_section("2. Packing & Environmental Prep", packing_items),
+            *_section("3. Routine & Wellness Transition", wellness_items),
+            *_section("4. Remote Work Setup", _REMOTE_WORK_ITEMS),
+        ]
+    )
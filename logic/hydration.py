@@ -1,4 +1,5 @@
 # logic/hydration.py
+import numpy as np
 import pandas as pd
 
 
@@ -9,13 +10,17 @@ def calculate_hydration_needs(
     Computes hourly and cumulative water intake recommendations.
     (Moved from logic.py)
     """
-    df = city_df[["Temperature (°C)", "Humidity (%)"]].copy()
+    # Only the first 24 hours are returned, so only those are computed
+    df = city_df[["Temperature (°C)", "Humidity (%)"]].iloc[:24].copy()
 
     base_hourly_intake_ml = (user_weight_kg * 35) / 16
-    temp_extra = df["Temperature (°C)"].apply(lambda t: max(0, (t - 25) / 5) * 150)
-    humidity_extra = df["Humidity (%)"].apply(lambda h: 50 if h > 60 else 0)
+    temps = df["Temperature (°C)"].to_numpy(dtype=np.float64)
+    humidity = df["Humidity (%)"].to_numpy()
+    temp_extra = np.maximum(0, (temps - 25) / 5) * 150
+    humidity_extra = np.where(humidity > 60, 50, 0)
 
-    df["Recommended Intake (ml)"] = base_hourly_intake_ml + temp_extra + humidity_extra
-    df["Cumulative Intake (ml)"] = df["Recommended Intake (ml)"].cumsum()
+    intake = base_hourly_intake_ml + temp_extra + humidity_extra
+    df["Recommended Intake (ml)"] = intake
+    df["Cumulative Intake (ml)"] = intake.cumsum()
 
-    return df.iloc[:24]
+    return df
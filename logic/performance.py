@@ -1,8 +1,13 @@
 # logic/performance.py
+import functools
 import pandas as pd
 import numpy as np
 from datetime import time
 
+# 15-minute sample grid shared by every curve
+_HOURS_IN_DAY = np.linspace(0, 24, 24 * 4)
+_HOURS_IN_DAY.flags.writeable = False
+
 
 def model_energy_curve(
     wake_time: time, sleep_time: time, chronotype: str = "Default"
@@ -13,12 +18,25 @@ def model_energy_curve(
     """
     wake_hour = wake_time.hour + wake_time.minute / 60
     sleep_hour = sleep_time.hour + sleep_time.minute / 60
+    performance = _performance_curve(wake_hour, sleep_hour, chronotype)
+    curve_df = pd.DataFrame({"Hour": _HOURS_IN_DAY, "Performance": performance})
+    return curve_df.round(1)
+
 
+@functools.lru_cache(maxsize=256)
+def _performance_curve(
+    wake_hour: float, sleep_hour: float, chronotype: str
+) -> np.ndarray:
+    """
+    Performance samples for one (wake, sleep, chronotype) combination.
+    Settings have minute resolution, so the input space is small and repeat
+    calls are served from the cache; the array is read-only because it is shared.
+    """
     if sleep_hour < wake_hour:
         sleep_hour += 24
 
     sleep_duration = sleep_hour - wake_hour
-    hours_in_day = np.linspace(0, 24, 24 * 4)  # 15-minute intervals
+    hours_in_day = _HOURS_IN_DAY
 
     # --- Chronotype Adjustments ---
     # These are offsets to shift the peak performance and afternoon dip.
@@ -32,27 +50,28 @@ def model_energy_curve(
         peak_offset = 0
         dip_offset = 0
 
-    performance = np.zeros_like(hours_in_day)
-
     # The primary peak is roughly a quarter way through the waking day
     primary_peak_hour = wake_hour + (sleep_duration / 4) + peak_offset
+    dip_hour = 14.0 + dip_offset
 
-    for i, hour in enumerate(hours_in_day):
-        if wake_hour <= hour < sleep_hour:
-            # Shifted sine wave for primary energy
-            circadian_phase = (hour - primary_peak_hour) / (sleep_duration / 2) * np.pi
-            circadian_effect = 0.8 * (np.cos(circadian_phase) + 0.1)
+    # Evaluate the whole waking window at once; asleep samples stay at zero
+    awake = (hours_in_day >= wake_hour) & (hours_in_day < sleep_hour)
+    hours = hours_in_day[awake]
 
-            # Shifted afternoon dip
-            dip_hour = 14.0 + dip_offset
-            dip_effect = -0.2 * np.exp(-((hour - dip_hour) ** 2) / 4)
+    # Shifted sine wave for primary energy
+    circadian_phase = (hours - primary_peak_hour) / (sleep_duration / 2) * np.pi
+    circadian_effect = 0.8 * (np.cos(circadian_phase) + 0.1)
 
-            # Ultradian cycles remain the same
-            ultradian_phase = (hour - wake_hour) / 1.5 * 2 * np.pi
-            ultradian_effect = 0.1 * np.sin(ultradian_phase)
+    # Shifted afternoon dip
+    dip_effect = -0.2 * np.exp(-((hours - dip_hour) ** 2) / 4)
 
-            performance[i] = (circadian_effect + dip_effect + ultradian_effect) * 100
+    # Ultradian cycles remain the same
+    ultradian_phase = (hours - wake_hour) / 1.5 * 2 * np.pi
+    ultradian_effect = 0.1 * np.sin(ultradian_phase)
+
+    performance = np.zeros_like(hours_in_day)
+    performance[awake] = (circadian_effect + dip_effect + ultradian_effect) * 100
 
     performance = np.clip(performance, 5, 100)
-    curve_df = pd.DataFrame({"Hour": hours_in_day, "Performance": performance})
-    return curve_df.round(1)
+    performance.flags.writeable = False
+    return performance
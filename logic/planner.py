@@ -1,57 +1,131 @@
 # logic/planner.py
+import numpy as np
 import pandas as pd
-import pytz
 from datetime import datetime, date, time, timedelta
 from typing import List, Dict, Any
 
-from logic.utils import to_az_hour  # We will create this helper function
+from logic.utils import HOME_TZ
 
 # --- A constant to normalize all daily tasks to a single reference date ---
 REFERENCE_DATE = date(2024, 1, 1)
 
 
-def create_unified_df(
+def _centered_rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Same result as Series.rolling(window, center=True, min_periods=1).mean(),
+    as two convolutions: window sums over the values and over the non-NaN count.
+    """
+    present = ~np.isnan(values)
+    kernel = np.ones(window)
+    sums = np.convolve(np.where(present, values, 0.0), kernel)
+    counts = np.convolve(present.astype(np.float64), kernel)
+    # Full-convolution slot k sums values[k - window + 1 : k + 1]; pandas centres
+    # a window on the element window // 2 positions after its start
+    start = window - 1 - window // 2
+    window_slice = slice(start, start + len(values))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums[window_slice] / counts[window_slice]
+
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def create_unified_long_df(
     city1_df: pd.DataFrame,
     city1_name: str,
     city2_df: pd.DataFrame,
     city2_name: str,
-    metric_col: str,
+    metrics: List[str],
 ) -> pd.DataFrame:
     """
-    Combines data, smooths it, and calculates daily averages.
-    Normalizes all times to Arizona Time.
-    (Moved from logic.py)
+    Combines data for several metrics in one pass, smooths it, and calculates
+    daily averages. Returns long-form rows (Hour, City, Day, Metric, Value,
+    Average), normalized to Arizona Time.
     """
-    home_tz = pytz.timezone("America/Phoenix")
 
     def process_df(df, city_name):
-        processed_df = df.copy()
-        processed_df["City"] = city_name
-        processed_df["Time_AZ"] = processed_df.index.tz_convert(home_tz)
-        processed_df["Hour"] = (
-            processed_df["Time_AZ"].dt.hour + processed_df["Time_AZ"].dt.minute / 60
-        )
-        processed_df["Day"] = processed_df["Time_AZ"].dt.strftime("%a %d")
-        smoothed_col_name = f"Smoothed_{metric_col}"
-        processed_df[smoothed_col_name] = (
-            processed_df[metric_col]
-            .rolling(window=4, center=True, min_periods=1)
-            .mean()
-        )
-        return processed_df
+        # Each city is reduced to plain column arrays; the two cities are then
+        # stacked array by array, so no intermediate per-city frame is built
+        time_az = df.index.tz_convert(HOME_TZ)
+        columns = {
+            metric: _centered_rolling_mean(df[metric].to_numpy(dtype=np.float64), 4)
+            for metric in metrics
+        }
+        columns["City"] = np.full(len(df), city_name, dtype=object)
+        columns["Hour"] = (time_az.hour + time_az.minute / 60).to_numpy()
+        # Format each calendar day once and broadcast the label to its hours
+        day_codes, days = pd.factorize(time_az.normalize())
+        columns["Day"] = days.strftime("%a %d").to_numpy()[day_codes]
+        # Integer minute of day: the grouping key behind the float Hour
+        columns["MinuteOfDay"] = (time_az.hour * 60 + time_az.minute).to_numpy()
+        return columns
+
+    parts = [process_df(city1_df, city1_name), process_df(city2_df, city2_name)]
+    stacked = {
+        column: np.concatenate([part[column] for part in parts]) for column in parts[0]
+    }
+    minute_of_day = stacked.pop("MinuteOfDay")
+    full_df = pd.DataFrame(stacked)
+    # Both labels repeat on every row; as categoricals they are stored as small
+    # integer codes, which the averaging below reuses for the city key
+    full_df["City"] = full_df["City"].astype("category")
+    full_df["Day"] = full_df["Day"].astype("category")
+    long_df = full_df.melt(
+        id_vars=["Hour", "City", "Day"],
+        value_vars=metrics,
+        var_name="Metric",
+        value_name="Value",
+    )
+
+    # Per-(City, Hour) means via np.bincount over a fixed table of
+    # city x minute-of-day cells, so no hashing of the float Hour is needed;
+    # the means are broadcast back by fancy indexing and melt stacks the
+    # metrics in order
+    city_codes = full_df["City"].cat.codes.to_numpy().astype(np.intp)
+    group = city_codes * _MINUTES_PER_DAY + minute_of_day
+    averages = []
+    for metric in metrics:
+        values = full_df[metric].to_numpy()
+        present = ~np.isnan(values)
+        sums = np.bincount(group, weights=np.where(present, values, 0.0))
+        counts = np.bincount(group, weights=present)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages.append((sums / counts)[group])
+    long_df["Average"] = np.concatenate(averages)
+    return long_df
 
-    full_df = pd.concat(
-        [process_df(city1_df, city1_name), process_df(city2_df, city2_name)]
+
+def create_unified_df(
+    city1_df: pd.DataFrame,
+    city1_name: str,
+    city2_df: pd.DataFrame,
+    city2_name: str,
+    metric_col: str,
+) -> pd.DataFrame:
+    """
+    Single-metric view of create_unified_long_df, shaped for plot_combined_metric.
+    (Moved from logic.py)
+    """
+    long_df = create_unified_long_df(
+        city1_df, city1_name, city2_df, city2_name, [metric_col]
     )
-    avg_df = (
-        full_df.groupby(["City", "Hour"])[f"Smoothed_{metric_col}"].mean().reset_index()
+    return long_df[["Hour", "Value", "City", "Day", "Average"]].rename(
+        columns={"Value": metric_col}
     )
-    avg_df.rename(columns={f"Smoothed_{metric_col}": "Average"}, inplace=True)
-    full_df = pd.merge(full_df, avg_df, on=["City", "Hour"])
 
-    return full_df[["Hour", f"Smoothed_{metric_col}", "City", "Day", "Average"]].rename(
-        columns={f"Smoothed_{metric_col}": metric_col}
-    )
+
+# Fixed parts of the sun annotations; each call copies them, never mutates
+_DAYLIGHT_SHAPE_TEMPLATE = dict(
+    type="rect",
+    xref="x",
+    yref="paper",
+    y0=0,
+    y1=1,
+    fillcolor="rgba(255, 224, 130, 0.3)",
+    layer="below",
+    line_width=0,
+)
+_SUN_ANNOTATION_TEMPLATE = dict(y=-0.1, xref="x", yref="paper", showarrow=False)
 
 
 def get_plot_annotations(
@@ -61,68 +135,69 @@ def get_plot_annotations(
     Generates background highlight and text annotations.
     (Moved from logic.py)
     """
-    sunrise_ref = city1_df["sunrise"].iloc[0]
-    sunset_ref = city1_df["sunset"].iloc[0]
-
-    shapes = [
-        dict(
-            type="rect",
-            xref="x",
-            yref="paper",
-            x0=to_az_hour(sunrise_ref),
-            y0=0,
-            x1=to_az_hour(sunset_ref),
-            y1=1,
-            fillcolor="rgba(255, 224, 130, 0.3)",
-            layer="below",
-            line_width=0,
-        ),
-    ]
-
-    text_annotations = []
+    # All four first sunrise/sunset instants go through one vectorized AZ
+    # conversion; city 1's pair also positions the daylight band
+    sun_instants = pd.to_datetime(
+        [
+            city1_df["sunrise"].iloc[0],
+            city1_df["sunset"].iloc[0],
+            city2_df["sunrise"].iloc[0],
+            city2_df["sunset"].iloc[0],
+        ],
+        utc=True,
+    ).tz_convert(HOME_TZ)
+    sun_hours = (sun_instants.hour + sun_instants.minute / 60).tolist()
     sun_times = [
         {
-            "city": city1_name,
             "char": "T",
             "color": "red",
-            "sunrise": city1_df["sunrise"].iloc[0],
-            "sunset": city1_df["sunset"].iloc[0],
+            "sunrise": sun_hours[0],
+            "sunset": sun_hours[1],
         },
         {
-            "city": city2_name,
             "char": "D",
             "color": "green",
-            "sunrise": city2_df["sunrise"].iloc[0],
-            "sunset": city2_df["sunset"].iloc[0],
+            "sunrise": sun_hours[2],
+            "sunset": sun_hours[3],
         },
     ]
+
+    shapes = [
+        {
+            **_DAYLIGHT_SHAPE_TEMPLATE,
+            "x0": sun_times[0]["sunrise"],
+            "x1": sun_times[0]["sunset"],
+        }
+    ]
+
+    text_annotations = []
     for item in sun_times:
-        text_annotations.append(
-            dict(
-                x=to_az_hour(item["sunrise"]),
-                y=-0.1,
-                xref="x",
-                yref="paper",
-                text=f"🌄{item['char']}",
-                showarrow=False,
-                font=dict(color=item["color"], size=14),
-            )
-        )
-        text_annotations.append(
-            dict(
-                x=to_az_hour(item["sunset"]),
-                y=-0.1,
-                xref="x",
-                yref="paper",
-                text=f"🌇{item['char']}",
-                showarrow=False,
-                font=dict(color=item["color"], size=14),
+        for icon, key in (("🌄", "sunrise"), ("🌇", "sunset")):
+            text_annotations.append(
+                {
+                    **_SUN_ANNOTATION_TEMPLATE,
+                    "x": item[key],
+                    "text": f"{icon}{item['char']}",
+                    "font": {"color": item["color"], "size": 14},
+                }
             )
-        )
 
     return {"shapes": shapes, "annotations": text_annotations}
 
 
+# --- Comfort wheel: ideal ranges and their fixed "Ideal" rows ---
+_COMFORT_IDEAL_RANGES = {
+    "Temperature (°C)": (20, 24),
+    "Humidity (%)": (40, 60),
+    "UV Index": (0, 2),
+}
+_COMFORT_METRICS = list(_COMFORT_IDEAL_RANGES)
+# Fixed, ordered metric levels; alphabetical, the order the wheel draws them in
+_COMFORT_METRIC_DTYPE = pd.CategoricalDtype(sorted(_COMFORT_METRICS), ordered=True)
+_IDEAL_ROWS_METRIC = [m for m in _COMFORT_IDEAL_RANGES for _ in range(2)]
+_IDEAL_ROWS_VALUE = [v for bounds in _COMFORT_IDEAL_RANGES.values() for v in bounds]
+
+
 def prepare_comfort_wheel_data(
     city1_df: pd.DataFrame, city1_name: str, city2_df: pd.DataFrame, city2_name: str
 ) -> pd.DataFrame:
@@ -130,58 +205,45 @@ def prepare_comfort_wheel_data(
     Prepares data for a dual-city Polar Comfort Wheel.
     (Moved from logic.py)
     """
-    ideal_ranges = {
-        "Temperature (°C)": [20, 24],
-        "Humidity (%)": [40, 60],
-        "UV Index": [0, 2],
-    }
-    all_data = []
-
-    # Process Cities
-    for city_name, city_df in [(city1_name, city1_df), (city2_name, city2_df)]:
-        current_metrics = city_df.iloc[0]
-        for metric, _ in ideal_ranges.items():
-            all_data.append(
-                {
-                    "Metric": metric,
-                    "Value": current_metrics[metric],
-                    "City": city_name,
-                    "Category": "Current",
-                }
-            )
-
-    # Add Ideal Range
-    for metric, ideal_range in ideal_ranges.items():
-        all_data.extend(
-            [
-                {
-                    "Metric": metric,
-                    "Value": ideal_range[0],
-                    "City": "Ideal",
-                    "Category": "Ideal",
-                },
-                {
-                    "Metric": metric,
-                    "Value": ideal_range[1],
-                    "City": "Ideal",
-                    "Category": "Ideal",
-                },
-            ]
-        )
-
-    return pd.DataFrame(all_data)
+    # Current readings for both cities, then the static ideal-range rows,
+    # assembled column by column in a single constructor call
+    current_values = [
+        # Round off float32 noise (e.g. 24.899999) before display
+        round(float(value), 2)
+        for city_df in (city1_df, city2_df)
+        for value in city_df[_COMFORT_METRICS].iloc[0]
+    ]
+    n_metrics, n_ideal = len(_COMFORT_METRICS), len(_IDEAL_ROWS_METRIC)
+    return pd.DataFrame(
+        {
+            "Metric": pd.Categorical(
+                _COMFORT_METRICS * 2 + _IDEAL_ROWS_METRIC, dtype=_COMFORT_METRIC_DTYPE
+            ),
+            "Value": current_values + _IDEAL_ROWS_VALUE,
+            # Labels repeat on every row; as categoricals the plot's filters
+            # compare small integer codes instead of strings
+            "City": pd.Categorical(
+                [city1_name] * n_metrics
+                + [city2_name] * n_metrics
+                + ["Ideal"] * n_ideal
+            ),
+            "Category": pd.Categorical(
+                ["Current"] * (2 * n_metrics) + ["Ideal"] * n_ideal
+            ),
+        }
+    )
 
 
 def _ensure_datetime_index(df):
     idx = df.index
-    if not isinstance(idx, pd.DatetimeIndex):
-        try:
-            idx = pd.to_datetime(idx)
-        except Exception:
-            raise ValueError(
-                "DataFrame index must be or convertible to DatetimeIndex for time-based plotting."
-            )
-    return idx
+    if isinstance(idx, pd.DatetimeIndex):
+        return idx  # Parsed forecasts always take this path; nothing to convert
+    try:
+        return pd.to_datetime(idx)
+    except Exception:
+        raise ValueError(
+            "DataFrame index must be or convertible to DatetimeIndex for time-based plotting."
+        )
 
 
 def build_gantt_df(
@@ -195,8 +257,8 @@ def build_gantt_df(
     REFACTORED: Creates a DataFrame for a 24-HOUR Gantt chart.
     All tasks are normalized to a single reference date for a "typical day" view.
     """
-    gantt_data = []
-    home_tz = pytz.timezone("America/Phoenix")
+    if not user_routine:
+        return pd.DataFrame()
 
     city1_dtidx = _ensure_datetime_index(city1_df)
     city2_dtidx = _ensure_datetime_index(city2_df)
@@ -215,65 +277,52 @@ def build_gantt_df(
     if tz2 is None:
         tz2 = city2_dtidx[0].tzinfo if hasattr(city2_dtidx[0], "tzinfo") else None
 
-    for task_item in user_routine:
-        try:
-            start_time_naive = datetime.strptime(task_item["start"], "%H:%M").time()
-            end_time_naive = datetime.strptime(task_item["end"], "%H:%M").time()
-
-            start_home_aware = home_tz.localize(
-                datetime.combine(REFERENCE_DATE, start_time_naive)
-            )
-            end_home_aware = home_tz.localize(
-                datetime.combine(REFERENCE_DATE, end_time_naive)
-            )
-
-            # Time-shift for City 1 and replace date with REFERENCE_DATE
-            start_city1 = start_home_aware.astimezone(tz1) if tz1 else start_home_aware
-            start_city1 = start_city1.replace(
-                year=REFERENCE_DATE.year,
-                month=REFERENCE_DATE.month,
-                day=REFERENCE_DATE.day,
-            )
-            end_city1 = end_home_aware.astimezone(tz1) if tz1 else end_home_aware
-            end_city1 = end_city1.replace(
-                year=REFERENCE_DATE.year,
-                month=REFERENCE_DATE.month,
-                day=REFERENCE_DATE.day,
-            )
-            gantt_data.append(
-                dict(
-                    Task=task_item["task"],
-                    Start=start_city1,
-                    Finish=end_city1,
-                    Resource=city1_name.split(",")[0],
-                )
-            )
-
-            # Time-shift for City 2 and replace date with REFERENCE_DATE
-            start_city2 = start_home_aware.astimezone(tz2) if tz2 else start_home_aware
-            start_city2 = start_city2.replace(
-                year=REFERENCE_DATE.year,
-                month=REFERENCE_DATE.month,
-                day=REFERENCE_DATE.day,
-            )
-            end_city2 = end_home_aware.astimezone(tz2) if tz2 else end_home_aware
-            end_city2 = end_city2.replace(
-                year=REFERENCE_DATE.year,
-                month=REFERENCE_DATE.month,
-                day=REFERENCE_DATE.day,
-            )
-            gantt_data.append(
-                dict(
-                    Task=task_item["task"],
-                    Start=start_city2,
-                    Finish=end_city2,
-                    Resource=city2_name.split(",")[0],
-                )
-            )
-        except (ValueError, TypeError):
-            continue  # Skip malformed routine items
-
-    return pd.DataFrame(gantt_data) if gantt_data else pd.DataFrame()
+    # Parse every routine item at once; malformed times become NaT and are skipped
+    tasks = [task_item["task"] for task_item in user_routine]
+    starts = pd.to_datetime(
+        [task_item["start"] for task_item in user_routine],
+        format="%H:%M",
+        errors="coerce",
+    )
+    ends = pd.to_datetime(
+        [task_item["end"] for task_item in user_routine],
+        format="%H:%M",
+        errors="coerce",
+    )
+    valid = ~(starts.isna() | ends.isna())
+    if not valid.any():
+        return pd.DataFrame()
+    tasks = [task for task, ok in zip(tasks, valid) if ok]
+
+    # Put the times on REFERENCE_DATE in AZ time, then time-shift to each city
+    reference_midnight = pd.Timestamp(REFERENCE_DATE)
+    day_offset = reference_midnight - starts[valid].normalize()
+    start_home = (starts[valid] + day_offset).tz_localize(HOME_TZ)
+    end_home = (ends[valid] + day_offset).tz_localize(HOME_TZ)
+
+    def to_city_reference_day(home_times, city_tz):
+        city_times = home_times.tz_convert(city_tz) if city_tz else home_times
+        # Move back onto REFERENCE_DATE while keeping the local wall-clock time
+        wall_clock = city_times.tz_localize(None)
+        city_times = city_times + (reference_midnight - wall_clock.normalize())
+        return city_times.to_pydatetime().tolist()
+
+    resource1, resource2 = city1_name.split(",")[0], city2_name.split(",")[0]
+    columns = {"Task": [], "Start": [], "Finish": [], "Resource": []}
+    # Rows alternate city 1 / city 2 for each task
+    for task, start1, end1, start2, end2 in zip(
+        tasks,
+        to_city_reference_day(start_home, tz1),
+        to_city_reference_day(end_home, tz1),
+        to_city_reference_day(start_home, tz2),
+        to_city_reference_day(end_home, tz2),
+    ):
+        columns["Task"] += [task, task]
+        columns["Start"] += [start1, start2]
+        columns["Finish"] += [end1, end2]
+        columns["Resource"] += [resource1, resource2]
+
+    return pd.DataFrame(columns)
 
 
 def get_gantt_background_annotations(city_df: pd.DataFrame) -> List[Dict[str, Any]]:
@@ -282,61 +331,78 @@ def get_gantt_background_annotations(city_df: pd.DataFrame) -> List[Dict[str, An
     for a single 24-hour Gantt chart view.
     """
     shapes = []
-    dtidx = _ensure_datetime_index(city_df)
     first_day_df = city_df.iloc[:24]
+    if not isinstance(first_day_df.index, pd.DatetimeIndex):
+        return shapes
 
     HEAT_TEMP_THRESHOLD, HEAT_UV_THRESHOLD = 30, 7
     COMFORT_TEMP_RANGE, COMFORT_UV_THRESHOLD = (18, 25), 4
+    ZONE_COLORS = {1: "rgba(255, 82, 82, 0.2)", 2: "rgba(119, 221, 119, 0.2)"}
+
+    temp = first_day_df["Temperature (°C)"]
+    uv = first_day_df["UV Index"]
+    heat = (temp > HEAT_TEMP_THRESHOLD) | (uv > HEAT_UV_THRESHOLD)
+    comfort = ~heat & temp.between(*COMFORT_TEMP_RANGE) & (uv < COMFORT_UV_THRESHOLD)
+    # 0 = no highlight, 1 = heat, 2 = comfort
+    zone = heat.astype(int) + comfort.astype(int) * 2
+
+    # Wall-clock times of the whole window moved onto REFERENCE_DATE at once
+    idx = first_day_df.index
+    wall_clock = idx.tz_localize(None)
+    reference_times = (
+        (pd.Timestamp(REFERENCE_DATE) + (wall_clock - wall_clock.normalize()))
+        .tz_localize(idx.tz)
+        .to_pydatetime()
+    )
 
-    for local_time, row in first_day_df.iterrows():
-        # local_time is the index, which should be a Timestamp
-        if not isinstance(local_time, pd.Timestamp):
+    # Consecutive hours in the same zone collapse into one rectangle; a run also
+    # ends where the wall clock wraps past midnight (e.g. on a 23-hour DST day)
+    # or skips ahead more than an hour (the missing hour at spring-forward)
+    clock = pd.Series(idx.hour * 60 + idx.minute, index=idx)
+    clock_step = clock.diff()
+    run_ids = ((zone != zone.shift()) | (clock_step < 0) | (clock_step > 60)).cumsum()
+    for run_positions in run_ids.groupby(run_ids, sort=False).indices.values():
+        first, last = run_positions[0], run_positions[-1]
+        if zone.iloc[first] == 0:
             continue
-        x0 = datetime.combine(REFERENCE_DATE, local_time.time()).replace(
-            tzinfo=local_time.tzinfo
-        )
-        x1 = x0 + timedelta(hours=1)
-
-        if (
-            row["Temperature (°C)"] > HEAT_TEMP_THRESHOLD
-            or row["UV Index"] > HEAT_UV_THRESHOLD
-        ):
-            shapes.append(
-                dict(
-                    type="rect",
-                    xref="x",
-                    yref="paper",
-                    x0=x0,
-                    y0=0,
-                    x1=x1,
-                    y1=1,
-                    fillcolor="rgba(255, 82, 82, 0.2)",
-                    layer="below",
-                    line_width=0,
-                )
-            )
-        elif (
-            COMFORT_TEMP_RANGE[0] <= row["Temperature (°C)"] <= COMFORT_TEMP_RANGE[1]
-            and row["UV Index"] < COMFORT_UV_THRESHOLD
-        ):
-            shapes.append(
-                dict(
-                    type="rect",
-                    xref="x",
-                    yref="paper",
-                    x0=x0,
-                    y0=0,
-                    x1=x1,
-                    y1=1,
-                    fillcolor="rgba(119, 221, 119, 0.2)",
-                    layer="below",
-                    line_width=0,
-                )
+        shapes.append(
+            dict(
+                type="rect",
+                xref="x",
+                yref="paper",
+                x0=reference_times[first],
+                y0=0,
+                x1=reference_times[last] + timedelta(hours=1),
+                y1=1,
+                fillcolor=ZONE_COLORS[zone.iloc[first]],
+                layer="below",
+                line_width=0,
             )
+        )
 
     return shapes
 
 
+def _parse_hm(value: str) -> time:
+    """Parses an "HH:MM" routine time without going through strptime."""
+    if not isinstance(value, str):
+        raise TypeError(f"Expected an 'HH:MM' string, got {type(value).__name__}")
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def _seconds_of_day(value):
+    """Wall-clock seconds since midnight for a time or a DatetimeIndex."""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _window_max(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Max of values[lo:hi] for each (lo, hi) pair, without a Python loop."""
+    positions = lo[:, None] + np.arange((hi - lo).max())
+    windows = values[np.minimum(positions, len(values) - 1)]
+    return np.where(positions < hi[:, None], windows, -np.inf).max(axis=1)
+
+
 def find_daily_best_workout(
     city_df: pd.DataFrame, user_routine: list, workout_duration_min: int
 ) -> List[Dict[str, Any]]:
@@ -349,80 +415,92 @@ def find_daily_best_workout(
         raise ValueError(
             "DataFrame index must be a DatetimeIndex for workout recommendation."
         )
-    unique_days = dtidx.normalize().unique()
+    day_starts = dtidx.normalize()
+    unique_days = day_starts.unique()
+
+    # The routine is the same every day, so its busy intervals are parsed once,
+    # as seconds since midnight for the vectorized overlap check below
+    busy_times = []
+    for task in user_routine:
+        try:
+            busy_times.append((_parse_hm(task["start"]), _parse_hm(task["end"])))
+        except (ValueError, TypeError):
+            continue
+    busy_starts = np.array([_seconds_of_day(start) for start, _ in busy_times])
+    busy_ends = np.array([_seconds_of_day(end) for _, end in busy_times])
+
+    # The index is sorted, so each day's rows are one contiguous positional slice
+    day_bounds = np.append(day_starts.searchsorted(unique_days), len(dtidx))
 
     for day_index, day_date in enumerate(unique_days[:3]):  # Limit to first 3 days
         # Select rows for this day
-        day_df = city_df[dtidx.normalize() == day_date]
+        day_df = city_df.iloc[day_bounds[day_index] : day_bounds[day_index + 1]]
         if day_df.empty:
             continue
 
-        # Create a list of busy time intervals for the day
-        busy_times = []
-        for task in user_routine:
-            try:
-                busy_times.append(
-                    (
-                        datetime.strptime(task["start"], "%H:%M").time(),
-                        datetime.strptime(task["end"], "%H:%M").time(),
-                    )
-                )
-            except (ValueError, TypeError):
-                continue
-
-        possible_slots = []
-        current_time = day_df.index.min()
-        day_end_time = day_df.index.max()
-
-        while current_time + timedelta(minutes=workout_duration_min) <= day_end_time:
-            workout_end = current_time + timedelta(minutes=workout_duration_min)
-            # Check if free
-            is_free = all(
-                current_time.time() >= busy_end or workout_end.time() <= busy_start
-                for busy_start, busy_end in busy_times
-            )
-            if is_free:
-                window_df = day_df.loc[current_time:workout_end]
-                if not window_df.empty:
-                    avg_temp = window_df["Temperature (°C)"].mean()
-                    avg_humidity = window_df["Humidity (%)"].mean()
-                    max_uv = window_df["UV Index"].max()
-                    # Scoring (lower is better)
-                    score = (
-                        max(0, avg_temp - 22) * 2
-                        + min(0, avg_temp - 15) * -1
-                        + max(0, avg_humidity - 60) * 0.5
-                        + max_uv * 5
-                    )
-                    if not (
-                        current_time >= window_df["sunrise"].iloc[0]
-                        and workout_end <= window_df["sunset"].iloc[0]
-                    ):
-                        score += 5  # Penalty for darkness
-                    else:
-                        score -= 10  # Bonus for daylight
-                    possible_slots.append(
-                        {
-                            "start_time": current_time,
-                            "score": score,
-                            "details": f"Temp: {avg_temp:.1f}°C, Hum: {avg_humidity:.1f}%, UV: {max_uv}",
-                        }
-                    )
-            current_time += timedelta(minutes=30)
-        if possible_slots:
-            best_slot = min(possible_slots, key=lambda x: x["score"])
-            day_label = (
-                "Today"
-                if day_index == 0
-                else (
-                    "Tomorrow"
-                    if day_index == 1
-                    else best_slot["start_time"].strftime("%A")
-                )
+        # Sweep candidate slots as int64 nanoseconds over the day's raw arrays
+        # rather than slicing a DataFrame by label for every slot
+        times = day_df.index.asi8
+        temps = day_df["Temperature (°C)"].to_numpy()
+        humidity = day_df["Humidity (%)"].to_numpy()
+        uv = day_df["UV Index"].to_numpy()
+        # Sunrise and sunset are the same on every row of a day
+        day_sunrise = day_df["sunrise"].iloc[0].value
+        day_sunset = day_df["sunset"].iloc[0].value
+
+        window_ns = pd.Timedelta(minutes=workout_duration_min).value
+        step_ns = pd.Timedelta(minutes=30).value
+        slot_starts = np.arange(times.min(), times.max() - window_ns + 1, step_ns)
+        slot_ends = slot_starts + window_ns
+        # Rows inside [start, end], matching the inclusive .loc label slice
+        window_lo = np.searchsorted(times, slot_starts, side="left")
+        window_hi = np.searchsorted(times, slot_ends, side="right")
+        local_starts = pd.DatetimeIndex(slot_starts, tz="UTC").tz_convert(dtidx.tz)
+        local_ends = pd.DatetimeIndex(slot_ends, tz="UTC").tz_convert(dtidx.tz)
+        start_clock = np.asarray(_seconds_of_day(local_starts))[:, None]
+        end_clock = np.asarray(_seconds_of_day(local_ends))[:, None]
+        # A slot is free when, against every busy interval, it starts after the
+        # interval ends or finishes before it starts: one (slots x tasks) pass
+        is_free = ((start_clock >= busy_ends) | (end_clock <= busy_starts)).all(axis=1)
+        in_daylight = (slot_starts >= day_sunrise) & (slot_ends <= day_sunset)
+
+        candidates = np.flatnonzero(is_free & (window_lo < window_hi))
+        if not candidates.size:
+            continue
+        # Overlapping windows share work: prefix sums give every window's total
+        # in O(1), and the UV maxima come from one padded 2-D reduction
+        lo, hi = window_lo[candidates], window_hi[candidates]
+        counts = hi - lo
+        temp_sums = np.concatenate(([0.0], np.cumsum(temps, dtype=np.float64)))
+        humidity_sums = np.concatenate(([0], np.cumsum(humidity, dtype=np.int64)))
+        avg_temps = (temp_sums[hi] - temp_sums[lo]) / counts
+        avg_humidities = (humidity_sums[hi] - humidity_sums[lo]) / counts
+        max_uvs = _window_max(uv, lo, hi)
+
+        # Scoring (lower is better), with a daylight bonus or darkness penalty
+        scores = (
+            np.maximum(0, avg_temps - 22) * 2
+            + np.minimum(0, avg_temps - 15) * -1
+            + np.maximum(0, avg_humidities - 60) * 0.5
+            + max_uvs * 5
+            + np.where(in_daylight[candidates], -10, 5)
+        )
+        # argmin keeps the earliest slot on ties, like min() over a list did
+        best = int(np.argmin(scores))
+        best_slot = {
+            "start_time": local_starts[candidates[best]],
+            "score": scores[best],
+            # UV comes from the float32 column, so print it at the API's one
+            # decimal instead of its float32 expansion (0.20000000298...)
+            "details": f"Temp: {avg_temps[best]:.1f}°C, Hum: {avg_humidities[best]:.1f}%, UV: {max_uvs[best]:.1f}",
+        }
+        day_label = (
+            "Today"
+            if day_index == 0
+            else (
+                "Tomorrow" if day_index == 1 else best_slot["start_time"].strftime("%A")
             )
-            best_slot["day_label"] = day_label
-            daily_bests.append(best_slot)
+        )
+        best_slot["day_label"] = day_label
+        daily_bests.append(best_slot)
     return daily_bests
-
-
-# (Other functions like create_unified_df remain unchanged but are not shown for brevity)
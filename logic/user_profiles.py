@@ -1,7 +1,9 @@
 # logic/user_profiles.py
+import functools
 import json
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
 # Build an absolute path to the data file
@@ -10,8 +12,27 @@ USER_PROFILES_PATH = os.path.join(
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _read_profiles(mtime_ns: int, size: int) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """
+    Parses the profiles file and sorts its names once; keyed on the file's
+    stat so edits invalidate it.
+    """
+    with open(USER_PROFILES_PATH, "r") as f:
+        profiles = json.load(f)
+    return profiles, tuple(sorted(profiles))
+
+
 def load_profiles() -> Dict[str, Any]:
-    """Load all user profiles from the JSON file."""
+    """
+    Load all user profiles from the JSON file.
+    The parsed result is shared between calls, so treat it as read-only.
+    """
+    return _load_profiles_and_names()[0]
+
+
+def _load_profiles_and_names() -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """The profiles dict and its sorted names, creating the default file if needed."""
     try:
         if not os.path.exists(USER_PROFILES_PATH):
             # Create a default if it doesn't exist
@@ -57,27 +78,29 @@ def load_profiles() -> Dict[str, Any]:
                 }
             }
             save_profiles(default_profile)
-            return default_profile
-        with open(USER_PROFILES_PATH, "r") as f:
-            return json.load(f)
+            return default_profile, tuple(sorted(default_profile))
+        stat = os.stat(USER_PROFILES_PATH)
+        return _read_profiles(stat.st_mtime_ns, stat.st_size)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Error loading profiles: {e}")
-        return {}
+        return {}, ()
 
 
 def save_profiles(profiles: Dict[str, Any]):
     """Save all user profiles to the JSON file."""
     try:
-        with open(USER_PROFILES_PATH, "w") as f:
+        # Write then rename, so a concurrent load never parses a partial file
+        tmp_path = f"{USER_PROFILES_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
             json.dump(profiles, f, indent=4)
+        os.replace(tmp_path, USER_PROFILES_PATH)
     except IOError as e:
         print(f"Error saving profiles: {e}")
 
 
 def get_profile_names() -> List[str]:
     """Get a list of all profile names."""
-    profiles = load_profiles()
-    return sorted(list(profiles.keys()))
+    return list(_load_profiles_and_names()[1])
 
 
 def get_profile(profile_name: str) -> Dict[str, Any]:
@@ -90,6 +113,6 @@ def save_profile(profile_name: str, profile_data: Dict[str, Any]):
     """Save or update a single profile."""
     if not profile_name.strip():
         raise ValueError("Profile name cannot be empty.")
-    profiles = load_profiles()
+    profiles = dict(load_profiles())  # Copy: the loaded dict is shared
     profiles[profile_name] = profile_data
     save_profiles(profiles)
@@ -1,9 +1,5 @@
 # logic/utils.py
-import pytz
+from zoneinfo import ZoneInfo
 
-
-def to_az_hour(dt_aware):
-    """Converts a timezone-aware datetime object to a float hour in Arizona time."""
-    home_tz = pytz.timezone("America/Phoenix")
-    az_time = dt_aware.astimezone(home_tz)
-    return az_time.hour + az_time.minute / 60
+# The user's home timezone; all routines are entered in this zone
+HOME_TZ = ZoneInfo("America/Phoenix")
@@ -1,7 +1,14 @@
 # logic/weather_parser.py
+import numpy as np
 import pandas as pd
-import pytz
-from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+def _hourly_field(all_hours: list, key: str, dtype) -> np.ndarray:
+    """Pulls one field out of the raw hourly dicts into a typed array."""
+    return np.fromiter(
+        (hour[key] for hour in all_hours), dtype=dtype, count=len(all_hours)
+    )
 
 
 def parse_weather_data(data: dict) -> pd.DataFrame:
@@ -9,56 +16,40 @@ def parse_weather_data(data: dict) -> pd.DataFrame:
     Parses the hourly weather data from the WeatherAPI.com response.
     (Moved from logic.py)
     """
+    forecast_days = data["forecast"]["forecastday"]
     all_hours = []
-    for day in data["forecast"]["forecastday"]:
+    for day in forecast_days:
         all_hours.extend(day["hour"])
 
-    df = pd.DataFrame(all_hours)
-    timezone_str = data["location"]["tz_id"]
-
-    df["dt"] = (
-        pd.to_datetime(df["time_epoch"], unit="s")
-        .dt.tz_localize("UTC")
-        .dt.tz_convert(timezone_str)
-    )
-
-    sunrise_sunset_map = {
-        day["date"]: {
-            "sunrise": day["astro"]["sunrise"],
-            "sunset": day["astro"]["sunset"],
-        }
-        for day in data["forecast"]["forecastday"]
-    }
-
-    def parse_astro_time(astro_time_str, date, tz):
-        return tz.localize(
-            datetime.strptime(f"{date} {astro_time_str}", "%Y-%m-%d %I:%M %p")
+    tz = ZoneInfo(data["location"]["tz_id"])
+    time_index = pd.to_datetime(
+        _hourly_field(all_hours, "time_epoch", np.int64), unit="s", utc=True
+    ).tz_convert(tz)
+    time_index.name = "Time"
+
+    # Sunrise/sunset are parsed once per forecast day, then repeated across
+    # that day's hours; every hour in a forecastday shares its local date
+    hours_per_day = [len(day["hour"]) for day in forecast_days]
+
+    def parse_astro_times(field: str) -> pd.DatetimeIndex:
+        stamps = [f"{day['date']} {day['astro'][field]}" for day in forecast_days]
+        return (
+            pd.to_datetime(stamps, format="%Y-%m-%d %I:%M %p")
+            .tz_localize(tz)
+            .repeat(hours_per_day)
         )
 
-    df["sunrise"] = df["dt"].apply(
-        lambda x: parse_astro_time(
-            sunrise_sunset_map[x.strftime("%Y-%m-%d")]["sunrise"],
-            x.strftime("%Y-%m-%d"),
-            pytz.timezone(timezone_str),
-        )
-    )
-    df["sunset"] = df["dt"].apply(
-        lambda x: parse_astro_time(
-            sunrise_sunset_map[x.strftime("%Y-%m-%d")]["sunset"],
-            x.strftime("%Y-%m-%d"),
-            pytz.timezone(timezone_str),
-        )
+    # Only the needed fields are pulled from the raw hours, one typed array per
+    # column, so no intermediate wide frame is built and then trimmed.
+    # Single-precision is ample for forecast readings (one decimal place) and
+    # whole-percent humidity fits in int16, shrinking what the planner carries
+    return pd.DataFrame(
+        {
+            "Temperature (°C)": _hourly_field(all_hours, "temp_c", np.float32),
+            "Humidity (%)": _hourly_field(all_hours, "humidity", np.int16),
+            "UV Index": _hourly_field(all_hours, "uv", np.float32),
+            "sunrise": parse_astro_times("sunrise"),
+            "sunset": parse_astro_times("sunset"),
+        },
+        index=time_index,
     )
-
-    df = df[["dt", "temp_c", "humidity", "uv", "sunrise", "sunset"]]
-    df = df.rename(
-        columns={
-            "dt": "Time",
-            "temp_c": "Temperature (°C)",
-            "humidity": "Humidity (%)",
-            "uv": "UV Index",
-        }
-    )
-
-    df.set_index("Time", inplace=True)
-    return df
@@ -15,26 +15,26 @@ def plot_combined_hydration(
     # Add City 1 trace
     fig.add_trace(
         go.Scatter(
-            x=df1.index,
-            y=df1["Cumulative Intake (ml)"],
+            x=df1.index.to_numpy(),
+            y=df1["Cumulative Intake (ml)"].to_numpy(),
             fill="tozeroy",
             mode="lines",
             line_color="rgba(255, 87, 87, 1.0)",  # Solid Red Line
             fillcolor="rgba(255, 87, 87, 0.3)",  # Light Red Fill
-            name=f"Hydration Need: {name1.split(',')[0]}",
+            name=f"Hydration Need: {name1.split(',', 1)[0]}",
         )
     )
 
     # Add City 2 trace
     fig.add_trace(
         go.Scatter(
-            x=df2.index,
-            y=df2["Cumulative Intake (ml)"],
+            x=df2.index.to_numpy(),
+            y=df2["Cumulative Intake (ml)"].to_numpy(),
             fill="tozeroy",
             mode="lines",
             line_color="rgba(0, 128, 0, 1.0)",  # Solid Green Line
             fillcolor="rgba(0, 128, 0, 0.3)",  # Light Green Fill
-            name=f"Hydration Need: {name2.split(',')[0]}",
+            name=f"Hydration Need: {name2.split(',', 1)[0]}",
         )
     )
 
@@ -58,6 +58,7 @@ def plot_energy_curve(df: pd.DataFrame):
         y="Performance",
         title="Predicted Energy Performance Curve",
         labels={"Performance": "Performance (%)", "Hour": "Hour of Day"},
+        render_mode="svg",  # Small series; never spend a WebGL context on it
     )
     fig.update_traces(
         fill="tozeroy",
@@ -1,13 +1,27 @@
 # plotting/gantt.py
-import plotly.figure_factory as ff
+import functools
+import plotly.graph_objects as go
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, time, date
 
 # --- A constant to match the logic file, ensuring axis ranges are correct ---
 REFERENCE_DATE = date(2024, 1, 1)
 
 
+def _wall_clock(times: pd.Series, tz) -> pd.Series:
+    """Aware datetimes as naive local times in `tz`, keeping the wall clock."""
+    return pd.to_datetime(times, utc=True).dt.tz_convert(tz).dt.tz_localize(None)
+
+
+@functools.lru_cache(maxsize=8)
+def _day_bounds(tz) -> Tuple[datetime, datetime]:
+    """The 24-hour x-axis range on REFERENCE_DATE, built once per timezone."""
+    start = datetime.combine(REFERENCE_DATE, time(0, 0)).replace(tzinfo=tz)
+    end = datetime.combine(REFERENCE_DATE, time(23, 59)).replace(tzinfo=tz)
+    return start, end
+
+
 def plot_gantt_schedule(
     gantt_df: pd.DataFrame, background_shapes: List[Dict[str, Any]] = None
 ):
@@ -20,31 +34,34 @@ def plot_gantt_schedule(
 
     city_name = gantt_df["Resource"].iloc[0]
 
-    # The color dictionary keys MUST match the values in the 'Resource' column.
-    # This dictionary might seem simple, but it's what Plotly needs.
-    colors = {
-        city_name: (
-            "rgb(255, 87, 87)" if "tempe" in city_name.lower() else "rgb(0, 128, 0)"
-        )
-    }
+    bar_color = "rgb(255, 87, 87)" if "tempe" in city_name.lower() else "rgb(0, 128, 0)"
 
-    # --- THE FIX IS HERE ---
-    fig = ff.create_gantt(
-        gantt_df,
-        colors=colors,
-        index_col="Resource",  # Index by the Resource (e.g., 'Tempe') for coloring.
-        show_colorbar=False,
-        group_tasks=True,  # This is CRUCIAL. It tells Plotly to group tasks by Resource.
-        title=f"Daily Schedule for {city_name}",
+    # Every task is one bar of a single horizontal bar trace: `base` is the
+    # start and `x` the duration in ms, instead of figure_factory's per-task
+    # filled scatter shapes built in Python
+    city_tz = gantt_df["Start"].iloc[0].tzinfo
+    starts = _wall_clock(gantt_df["Start"], city_tz)
+    finishes = _wall_clock(gantt_df["Finish"], city_tz)
+    fig = go.Figure(
+        go.Bar(
+            base=starts,
+            x=(finishes - starts).dt.total_seconds() * 1000,
+            y=gantt_df["Task"],
+            orientation="h",
+            marker_color=bar_color,
+            name=city_name,
+            hovertext=starts.dt.strftime("%I:%M %p")
+            + " - "
+            + finishes.dt.strftime("%I:%M %p"),
+            hovertemplate="%{y}<br>%{hovertext}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=f"Daily Schedule for {city_name}", height=600, showlegend=False
     )
 
     # Define the 24-hour range for the x-axis
-    x_axis_start = datetime.combine(REFERENCE_DATE, time(0, 0)).replace(
-        tzinfo=gantt_df["Start"].iloc[0].tzinfo
-    )
-    x_axis_end = datetime.combine(REFERENCE_DATE, time(23, 59)).replace(
-        tzinfo=gantt_df["Start"].iloc[0].tzinfo
-    )
+    x_axis_start, x_axis_end = _day_bounds(city_tz)
 
     layout_updates = {
         "xaxis_title": "Time of Day (Local Time)",
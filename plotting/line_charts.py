@@ -1,9 +1,64 @@
 # plotting/line_charts.py
+import functools
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 import webcolors
-from colorsys import rgb_to_hls, hls_to_rgb
+from colorsys import rgb_to_hls
+from typing import Tuple
+
+
+def _hue_channel(m1: np.ndarray, m2: np.ndarray, hue: float) -> np.ndarray:
+    """colorsys' per-channel HLS->RGB step, applied to whole arrays."""
+    hue = hue % 1.0
+    return np.select(
+        [hue < 1 / 6, hue < 0.5, hue < 2 / 3],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0],
+        default=m1,
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _get_color_gradient(base_color: str, n: int) -> Tuple[str, ...]:
+    """
+    n shades of a named color, light to dark, as Plotly rgb() strings.
+    Only a couple of (color, day count) pairs ever occur, so the result is cached.
+    """
+    r, g, b = webcolors.name_to_rgb(base_color)
+    h, l, s = rgb_to_hls(r / 255.0, g / 255.0, b / 255.0)
+    light = np.clip(np.linspace(l + 0.2, l - 0.1, n), 0, 1)
+    # Same formulas as colorsys.hls_to_rgb, over every shade at once
+    m2 = np.where(light <= 0.5, light * (1.0 + s), light + s - light * s)
+    m1 = 2.0 * light - m2
+    rgb = np.stack(
+        [
+            _hue_channel(m1, m2, h + 1 / 3),
+            _hue_channel(m1, m2, h),
+            _hue_channel(m1, m2, h - 1 / 3),
+        ],
+        axis=1,
+    )
+    # int() truncation, as before
+    channels = (rgb * 255).astype(np.int64).tolist()
+    return tuple(f"rgb({red}, {green}, {blue})" for red, green, blue in channels)
+
+
+# Layout pieces shared by every hourly metric chart, built once at import;
+# each call only adds its title, y-axis label, shapes and annotations
+_GRID_STYLE = dict(showgrid=True, gridwidth=1, gridcolor="lightgray")
+_HOURLY_LAYOUT = dict(
+    xaxis=dict(
+        title=dict(text="Time of Day (AZ Time)"),
+        tickmode="array",
+        tickvals=[0, 3, 6, 9, 12, 15, 18, 21, 24],
+        ticktext=["12AM", "3AM", "6AM", "9AM", "12PM", "3PM", "6PM", "9PM", "12AM"],
+        range=[0, 24],
+        **_GRID_STYLE,
+    ),
+    plot_bgcolor="white",
+    margin=dict(b=100),
+    legend=dict(title=dict(text="Forecast")),
+)
 
 
 def plot_combined_metric(
@@ -13,62 +68,51 @@ def plot_combined_metric(
     Creates a multi-trace plot with daily dashed lines and a solid average line.
     (Moved from plotting.py)
     """
-    fig = go.Figure()
+    traces = []
     city_colors = {city1: "red", city2: "green"}
+    short_names = {city: city.split(",", 1)[0] for city in city_colors}
 
-    def get_color_gradient(base_color, n):
-        r, g, b = webcolors.name_to_rgb(base_color)
-        h, l, s = rgb_to_hls(r / 255.0, g / 255.0, b / 255.0)
-        lightness_gradient = np.linspace(l + 0.2, l - 0.1, n)
-        return [
-            f"rgb{tuple(int(x * 255) for x in hls_to_rgb(h, light, s))}"
-            for light in np.clip(lightness_gradient, 0, 1)
-        ]
-
+    # One partition pass per level instead of a boolean scan per city and day;
+    # observed=True keeps categorical labels from yielding empty groups
+    by_city = dict(list(df.groupby("City", sort=False, observed=True)))
     for city_name, base_color in city_colors.items():
-        city_df = df[df["City"] == city_name]
-        days = city_df["Day"].unique()
-        color_palette = get_color_gradient(base_color, len(days))
-        for i, day in enumerate(days):
-            day_df = city_df[city_df["Day"] == day]
-            fig.add_trace(
-                go.Scatter(
-                    x=day_df["Hour"],
-                    y=day_df[metric],
+        city_df = by_city.get(city_name, df.iloc[:0])
+        day_groups = list(city_df.groupby("Day", sort=False, observed=True))
+        color_palette = _get_color_gradient(base_color, len(day_groups))
+        for i, (day, day_df) in enumerate(day_groups):
+            traces.append(
+                dict(
+                    type="scatter",
+                    x=day_df["Hour"].to_numpy(),
+                    y=day_df[metric].to_numpy(),
                     mode="lines",
                     line=dict(color=color_palette[i], width=1.5, dash="dash"),
-                    name=f"{city_name.split(',')[0]} {day}",
+                    name=f"{short_names[city_name]} {day}",
                     legendgroup=city_name,
                 )
             )
         avg_df = city_df[["Hour", "Average"]].drop_duplicates().sort_values("Hour")
-        fig.add_trace(
-            go.Scatter(
-                x=avg_df["Hour"],
-                y=avg_df["Average"],
+        traces.append(
+            dict(
+                type="scatter",
+                x=avg_df["Hour"].to_numpy(),
+                y=avg_df["Average"].to_numpy(),
                 mode="lines",
                 line=dict(color=base_color, width=4),
-                name=f"{city_name.split(',')[0]} Avg",
+                name=f"{short_names[city_name]} Avg",
                 legendgroup=city_name,
             )
         )
 
-    fig.update_layout(
-        title=f"Hourly {metric.split('(')[0].strip()}: {city2.split(',')[0]} (green) vs {city1.split(',')[0]} (red)",
-        xaxis_title="Time of Day (AZ Time)",
-        yaxis_title=metric,
-        xaxis=dict(
-            tickmode="array",
-            tickvals=[0, 3, 6, 9, 12, 15, 18, 21, 24],
-            ticktext=["12AM", "3AM", "6AM", "9AM", "12PM", "3PM", "6PM", "9PM", "12AM"],
+    # Traces are plain dicts and, with the layout, shapes and annotations, go
+    # through a single constructor, so Plotly validates the figure only once
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            title=f"Hourly {metric.split('(')[0].strip()}: {short_names[city2]} (green) vs {short_names[city1]} (red)",
+            **_HOURLY_LAYOUT,
+            yaxis=dict(title=dict(text=metric), **_GRID_STYLE),
+            shapes=annotations["shapes"],
+            annotations=annotations["annotations"],
         ),
-        plot_bgcolor="white",
-        margin=dict(b=100),
-        legend_title_text="Forecast",
     )
-    fig.update_layout(shapes=annotations["shapes"])
-    for anno in annotations["annotations"]:
-        fig.add_annotation(**anno)
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor="lightgray", range=[0, 24])
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor="lightgray")
-    return fig
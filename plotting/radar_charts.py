@@ -1,6 +1,31 @@
 # plotting/radar_charts.py
+import functools
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
+from typing import Dict, Tuple
+
+
+def _close_loop(values: np.ndarray) -> np.ndarray:
+    """Repeats the first point at the end so the polar outline is closed."""
+    return np.concatenate([values, values[:1]])
+
+
+@functools.lru_cache(maxsize=8)
+def _ideal_range_tops(
+    ideal_rows: Tuple[Tuple[str, float], ...],
+) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Metrics in sorted order and the top of each ideal range. The ideal rows are
+    the same on every render, so this is worked out once and cached.
+    """
+    tops: Dict[str, float] = {}
+    for metric, value in ideal_rows:
+        tops[metric] = max(tops.get(metric, value), value)
+    metrics = tuple(sorted(tops))
+    top_values = np.array([tops[metric] for metric in metrics], dtype=np.float64)
+    top_values.flags.writeable = False  # Shared between cached calls
+    return metrics, top_values
 
 
 def plot_comfort_wheel(df: pd.DataFrame, city1_name: str, city2_name: str):
@@ -8,24 +33,25 @@ def plot_comfort_wheel(df: pd.DataFrame, city1_name: str, city2_name: str):
     Creates a radar chart comparing two cities against an ideal range.
     (UPDATED with higher transparency)
     """
-    fig = go.Figure()
-    ideal_df = (
-        df[df["City"] == "Ideal"]
-        .groupby("Metric")["Value"]
-        .agg(["min", "max"])
-        .reset_index()
+    short1, short2 = city1_name.split(",", 1)[0], city2_name.split(",", 1)[0]
+    ideal = df["City"] == "Ideal"
+    metrics, ideal_tops = _ideal_range_tops(
+        tuple(zip(df.loc[ideal, "Metric"], df.loc[ideal, "Value"]))
     )
-    metric_order = ideal_df["Metric"]
-    fig.add_trace(
-        go.Scatterpolar(
-            r=list(ideal_df["max"]) + list(ideal_df["max"])[:1],
-            theta=list(ideal_df["Metric"]) + list(ideal_df["Metric"])[:1],
+    metric_order = list(metrics)
+    # Every trace walks the metrics in the same order, so theta is shared
+    theta = _close_loop(np.array(metric_order, dtype=object))
+    traces = [
+        dict(
+            type="scatterpolar",
+            r=_close_loop(ideal_tops),
+            theta=theta,
             fill="toself",
             fillcolor="rgba(44, 160, 44, 0.2)",  # Ideal range remains the same
             line=dict(color="rgba(44, 160, 44, 0.4)"),
             name="Ideal Range",
         )
-    )
+    ]
 
     # --- UPDATED: Reduced opacity for better overlap visibility ---
     city_plot_config = {
@@ -34,29 +60,41 @@ def plot_comfort_wheel(df: pd.DataFrame, city1_name: str, city2_name: str):
     }
 
     for city, config in city_plot_config.items():
-        city_df = (
-            df[df["City"] == city].set_index("Metric").loc[metric_order].reset_index()
+        # Align the city's readings to the shared metric order in one reindex.
+        # Comparing a city with itself repeats its rows, so keep the first
+        # reading per metric; reindex rejects duplicate labels.
+        city_values = (
+            df.loc[df["City"] == city, ["Metric", "Value"]]
+            .drop_duplicates("Metric")
+            .set_index("Metric")["Value"]
+            .reindex(metric_order)
+            .to_numpy()
         )
-        fig.add_trace(
-            go.Scatterpolar(
-                r=list(city_df["Value"])
-                + list(city_df["Value"])[:1],  # stylistic: closes loop with first value
-                theta=list(city_df["Metric"]) + list(city_df["Metric"])[:1],
+        traces.append(
+            dict(
+                type="scatterpolar",
+                r=_close_loop(city_values),
+                theta=theta,
                 fill="toself",
                 fillcolor=config["fill"],
                 line=dict(color=config["color"]),
-                name=f"Current: {city.split(',')[0]}",
+                name=f"Current: {city.split(',', 1)[0]}",
             )
         )
 
     max_val = df[df["Category"] == "Current"]["Value"].max()
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, max(max_val, 30) * 1.1])),
-        showlegend=True,
-        title=f"Polar Comfort Wheel: {city1_name.split(',')[0]} (Red) vs. {city2_name.split(',')[0]} (Green)",
-        height=500,
-        legend=dict(
-            orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
-        ),  # Improved legend position
+    # Plain-dict traces and one constructor call: Plotly validates only once
+    return go.Figure(
+        data=traces,
+        layout=dict(
+            polar=dict(
+                radialaxis=dict(visible=True, range=[0, max(max_val, 30) * 1.1])
+            ),
+            showlegend=True,
+            title=f"Polar Comfort Wheel: {short1} (Red) vs. {short2} (Green)",
+            height=500,
+            legend=dict(
+                orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
+            ),  # Improved legend position
+        ),
     )
-    return fig